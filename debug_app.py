@@ -1,7 +1,7 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
+import plotly.graph_objects as go
 from model import DeterministicModel
 
 st.set_page_config(layout="wide", page_title="Model Debugger")
@@ -34,16 +34,18 @@ test_return = st.slider("👇 If the Market Return is exactly...", 1.0, 10.0, 4.
 
 # --- 3. RUN THE SIMULATION ---
 model = DeterministicModel(current_age, death_age, sa, prem_wl, prem_term, wl_par, pay_term)
-df = model.calculate_simulation(test_return, 0.0) # 0% discount rate to see raw cash
+ages, btid_n, wl_n = model.calculate_nominal(test_return) # Raw cash only, no discounting
+df = pd.DataFrame({"Age": ages, "BTID_Nominal": btid_n, "WL_Nominal": wl_n})
 
 # --- 4. FIND THE CROSSOVER (The "Brain" of the Frontier Graph) ---
 # Filter: Only look after Age 35 (ignore early noise)
 start_check_age = current_age + 5
-valid_zone = df[df['Age'] > start_check_age]
-winning_rows = valid_zone[valid_zone['WL_Nominal'] > valid_zone['BTID_Nominal']]
+wl_ahead = (wl_n > btid_n) & (ages > start_check_age)
 
-if not winning_rows.empty:
-    crossover_age = winning_rows['Age'].iloc[0]
+first = np.argmax(wl_ahead)  # 0 if there's no True at all, hence the check below
+
+if wl_ahead[first]:
+    crossover_age = int(ages[first])
     status = "✅ BTID WINS"
     status_color = "green"
     msg = f"At {test_return*100:.1f}% return, BTID overtakes Whole Life at **Age {crossover_age}**."
@@ -61,9 +63,10 @@ with col1:
     st.write(msg)
     
     # Plot
-    fig = px.line(df, x="Age", y=["BTID_Nominal", "WL_Nominal"], 
-                  color_discrete_map={"BTID_Nominal": "green", "WL_Nominal": "blue"},
-                  title=f"Scenario: {test_return*100:.1f}% Market Return")
+    fig = go.Figure()
+    fig.add_trace(go.Scattergl(x=ages, y=btid_n, mode='lines', name="BTID_Nominal", line=dict(color="green")))
+    fig.add_trace(go.Scattergl(x=ages, y=wl_n, mode='lines', name="WL_Nominal", line=dict(color="blue")))
+    fig.update_layout(title=f"Scenario: {test_return*100:.1f}% Market Return", xaxis_title="Age", yaxis_title="value")
     
     # Highlight the Crossover
     if crossover_age < 100:
@@ -80,17 +83,17 @@ with col2:
     if crossover_age < 100:
         radius = 3
         # Find index of crossover
-        idx = df[df['Age'] == crossover_age].index[0]
+        idx = crossover_age - current_age
         start = max(0, idx - radius)
         end = min(len(df), idx + radius + 1)
         
-        subset = df.iloc[start:end][['Age', 'BTID_Nominal', 'WL_Nominal']].copy()
+        subset = df.iloc[start:end].copy()
         subset['Diff'] = subset['BTID_Nominal'] - subset['WL_Nominal']
         
-        # Format for readability
-        st.dataframe(subset.style.format("{:,.0f}").apply(
-            lambda x: ['background: #d4edda' if (x.name == idx) else '' for i in x], axis=1
-        ))
+        # Format for readability; highlight the crossover row with one precomputed style frame
+        styles = pd.DataFrame('', index=subset.index, columns=subset.columns)
+        styles.loc[idx, :] = 'background: #d4edda'
+        st.dataframe(subset.style.format("{:,.0f}").apply(lambda _: styles, axis=None))
     else:
         st.write("No crossover found. Showing end of simulation:")
-        st.dataframe(df.tail(5)[['Age', 'BTID_Nominal', 'WL_Nominal']])
\ No newline at end of file
+        st.dataframe(df.tail(5))
\ No newline at end of file
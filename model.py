@@ -1,6 +1,236 @@
+from collections import namedtuple
+from functools import cached_property, lru_cache
+
 import numpy as np
 import pandas as pd
 import streamlit as st
+from numba import njit
+
+# Act 1 projection as plain arrays, one entry per age from current_age to death_age + 1
+SimulationResult = namedtuple(
+    "SimulationResult", ["age", "btid_nominal", "wl_nominal", "btid_death", "wl_death", "btid_pv", "wl_pv"]
+)
+
+
+@njit(cache=True)
+def _btid_fund_kernel(cf, investment_return):
+    """BTID fund at t = 0..len(cf). It's clipped at zero every year, so this stays a (branchless) loop."""
+    fund = np.zeros(len(cf) + 1)
+    for t in range(1, len(cf) + 1):
+        fund[t] = max((fund[t - 1] + cf[t - 1]) * (1 + investment_return), 0.0)
+    return fund
+
+
+@njit(cache=True)
+def _find_crossover(investment_return, cf, wl, current_age, payment_term, term_expiry_age, wl_par_return):
+    """First age (after the 5-year grace period) where WL cash value beats the BTID fund, else 100."""
+    fund = 0.0
+    for t in range(1, len(wl)):
+        fund = max((fund + cf[t - 1]) * (1 + investment_return), 0.0)
+        if t > 5 and wl[t] > fund:
+            return current_age + t
+        # Early exit: premiums are done, WL just compounds at the bonus rate and BTID is ahead
+        # and compounding at least as fast, so WL can never catch up.
+        if (t >= payment_term and current_age + t + 1 >= term_expiry_age
+                and investment_return >= wl_par_return and fund >= wl[t]):
+            return 100
+    return 100
+
+
+@njit(cache=True)
+def _frontier_kernel(returns, cf, wl, current_age, payment_term, term_expiry_age, wl_par_return):
+    # ~100 short scans: a plain loop beats spinning up a thread pool
+    out = np.empty(returns.size, np.int64)
+    for j in range(returns.size):
+        out[j] = _find_crossover(returns[j], cf, wl, current_age, payment_term, term_expiry_age, wl_par_return)
+    return out
+
+
+_MAX_AGE = 100  # The hard stop: everyone dies at 100
+_DTPD_MAX_AGE = 120  # DTPD rates run further so the Act 2 risk gauge can look past 100
+
+
+# --- ACTUARIAL TABLES ---
+@st.cache_data
+def load_actuarial_tables():
+    df_death = pd.read_csv("death_rates.csv")
+    df_ci = pd.read_csv("ci_rates.csv")
+    return df_death, df_ci
+
+
+@lru_cache(maxsize=None)
+def _gender_rates(gender):
+    """Latest-year q_x (ages 0..100) and loaded DTPD incidence (x1.3, ages 0..120) for one gender; 5% where missing."""
+    df_death, _ = load_actuarial_tables()
+    latest_year = df_death['year'].max()
+    latest = df_death[(df_death['year'] == latest_year) & (df_death['sex'] == gender)]
+
+    # age_x is read as text ("100_and_over" closes the table), so parse it; anything that isn't a plain age keeps 5%
+    ages = pd.to_numeric(latest['age_x'], errors='coerce')
+    keep = (ages <= _MAX_AGE).to_numpy()
+    q_death = np.full(_MAX_AGE + 1, 0.05)
+    q_death[ages.to_numpy()[keep].astype(np.int64)] = latest['qx'].to_numpy()[keep]
+    q_death.flags.writeable = False
+    return q_death, _dtpd_rates(gender)
+
+
+@lru_cache(maxsize=None)
+def _dtpd_rates(gender):
+    """Loaded S0408DTPD incidence (x1.3) indexed by age 0..120; ages missing from the table default to 5%."""
+    _, df_ci = load_actuarial_tables()
+    ci_col = "S0408DTPD Male" if gender == "Male" else "S0408DTPD Female"
+    q = df_ci.set_index('Age Last')[ci_col] / 1000.0 * 1.3
+    rates = q.reindex(range(_DTPD_MAX_AGE + 1)).fillna(0.05).to_numpy()
+    rates.flags.writeable = False
+    return rates
+
+
+@lru_cache(maxsize=1024)
+def _cumulative_risk(current_age, target_age, gender):
+    q_risk = _dtpd_rates(gender)[current_age:target_age]
+    # Years past the end of the array get the same 5% default as ages missing from the table
+    extra_years = max(target_age - max(current_age, _DTPD_MAX_AGE + 1), 0)
+    return (1 - np.prod(1 - q_risk) * 0.95 ** extra_years) * 100
+
+
+# --- MONTE CARLO ---
+# Event chains are packed 2 bits per event, first event in the lowest bits; 0 bits = no more events
+_EV_DEATH, _EV_CI = 1, 2
+_EVENT_NAMES = {_EV_DEATH: "Death", _EV_CI: "CI"}
+# Mortality loading by number of CIs suffered so far (0, 1, 2+): sick people die faster
+_LOAD_MULT = np.array([1.0, 2.5, 5.0])
+
+
+def _decode_chain(chain):
+    """Packed event chain -> list of event names, in order."""
+    names = []
+    while chain:
+        names.append(_EVENT_NAMES[chain & 3])
+        chain >>= 2
+    return names
+
+
+@njit(cache=True, nogil=True)
+def _simulate_life(rolls, current_age, sa, prem_wl, prem_term, multiplier_factor,
+                   wl_sv, pay_mask, term_mask, mult_mask,
+                   q_death, q_ci, r_inv, r_disc, limit_wl_claims, enable_multi_pay):
+    """
+    One simulated life. `rolls` holds one uniform draw per year from current_age and the rate tables are
+    indexed by age; the policy schedules come from the model (wl_sv by policy year, masks by t = age - current_age).
+    Returns (final_age, diff, packed event chain).
+    """
+    limit_term_claims = 1
+    age = current_age
+
+    # State Tracking
+    wl_claims_count = 0
+    term_claims_count = 0
+    health_ci_count = 0  # Tracks physical health separate from policy claims
+
+    btid_fund = 0.0
+    wl_cash_received = 0.0
+    wl_paid_age = current_age  # wl_cash_received is valued as at this age
+    wl_active = True
+    term_active = True
+    chain = 0
+    n_events = 0
+
+    while age <= _MAX_AGE:
+        t = age - current_age
+        year_idx = t + 1
+
+        # --- 1. MORTALITY & HEALTH DYNAMICS ---
+        base_q_d = q_death[age]
+        base_q_ci = q_ci[age]
+
+        # Mortality Loading: Healthier people live longer
+        q_d = min(0.99, base_q_d * _LOAD_MULT[min(health_ci_count, 2)])
+
+        # Grim Reaper at 100
+        if age == _MAX_AGE:
+            is_death = True
+            is_ci = False
+        else:
+            roll = rolls[t]
+            is_death = roll < q_d
+            is_ci = (not is_death) and roll < (q_d + base_q_ci)
+
+        if is_ci: health_ci_count += 1
+
+        # --- 2. POLICY VALUES (precomputed) ---
+        mult = multiplier_factor if mult_mask[t] else 1.0
+        wl_sv_current = wl_sv[year_idx]
+
+        # --- 3. EVENT HANDLING (only log if money moves) ---
+        if is_death or is_ci:
+            paid = False
+            if wl_active and wl_claims_count < limit_wl_claims:
+                if wl_claims_count == 0: payout = max(sa * mult, sa + wl_sv_current)
+                else: payout = sa * mult  # Multi-Pay
+                # Roll earlier payouts forward to today in one go, then add this one
+                wl_cash_received = wl_cash_received * (1 + r_inv) ** (age - wl_paid_age) + payout
+                wl_paid_age = age
+                wl_claims_count += 1
+                if is_death or not enable_multi_pay: wl_active = False
+                paid = True
+
+            if term_active and term_claims_count < limit_term_claims and term_mask[t]:
+                btid_fund += sa
+                term_claims_count += 1
+                term_active = False
+                paid = True
+
+            if paid:
+                chain |= (_EV_DEATH if is_death else _EV_CI) << (2 * n_events)
+                n_events += 1
+
+            if is_death: break
+
+        # --- 4. CASHFLOW ---
+        budget = prem_wl if pay_mask[year_idx] else 0.0
+        term_premium_due = prem_term if (term_mask[t] and term_active) else 0.0
+        btid_fund = max((btid_fund + budget - term_premium_due) * (1 + r_inv), 0.0)
+
+        age += 1
+
+        # Nothing left to pay out or pay in: only the death age matters now, and the fund just compounds
+        t = age - current_age
+        wl_done = not wl_active or wl_claims_count >= limit_wl_claims
+        term_done = not term_active or not term_mask[t]
+        if wl_done and term_done and not pay_mask[t + 1]:
+            start = age
+            while age < _MAX_AGE:
+                q_d = min(0.99, q_death[age] * _LOAD_MULT[min(health_ci_count, 2)])
+                roll = rolls[age - current_age]
+                if roll < q_d: break
+                if roll < q_d + q_ci[age]: health_ci_count += 1
+                age += 1
+            btid_fund *= (1 + r_inv) ** (age - start)
+            break
+
+    # WL payouts are invested at r_inv until death (not during the death year itself)
+    wl_cash_received *= (1 + r_inv) ** (age - wl_paid_age)
+    pv_factor = (1 + r_disc) ** -(age - current_age)
+    return age, (btid_fund * pv_factor) - (wl_cash_received * pv_factor), chain
+
+
+@njit(cache=True, nogil=True)
+def _run_mc_kernel(rolls, current_age, sa, prem_wl, prem_term, multiplier_factor,
+                   wl_sv, pay_mask, term_mask, mult_mask,
+                   q_death, q_ci, r_inv, r_disc, limit_wl_claims, enable_multi_pay):
+    """All lives at once, one row of `rolls` per life. Serial: 1,000 lives take well under a millisecond."""
+    n_sims = rolls.shape[0]
+    final_ages = np.empty(n_sims, np.int64)
+    diffs = np.empty(n_sims)
+    chains = np.empty(n_sims, np.int64)
+    for i in range(n_sims):
+        final_ages[i], diffs[i], chains[i] = _simulate_life(
+            rolls[i], current_age, sa, prem_wl, prem_term, multiplier_factor,
+            wl_sv, pay_mask, term_mask, mult_mask,
+            q_death, q_ci, r_inv, r_disc, limit_wl_claims, enable_multi_pay
+        )
+    return final_ages, diffs, chains
+
 
 class DeterministicModel:
     def __init__(self, current_age, death_age, sa, prem_wl, prem_term, wl_par_return, payment_term, 
@@ -16,252 +246,139 @@ class DeterministicModel:
         self.multiplier_age = int(multiplier_age)
         self.term_expiry_age = int(term_expiry_age)
 
-    # ... [Keep calculate_simulation (Act 1) and get_crossover_age (Frontier) here] ...
-    # (Pasting essential Act 1 logic for completeness)
-    def calculate_simulation(self, investment_return, discount_rate):
+        # Policy-year masks indexed by t = years from now, long enough for both the projection and the frontier
+        t = np.arange(max(self.death_age, _MAX_AGE) - self.current_age + 2)
+        self._pay_mask = t <= self.payment_term
+        self._term_mask = self.current_age + t < self.term_expiry_age
+        self._mult_mask = self.current_age + t < self.multiplier_age
+
+    def _btid_cashflows(self, duration):
+        """Net amount going into the BTID fund in years t = 1..duration."""
+        return np.where(self._pay_mask[1:duration + 1], self.prem_wl - self.prem_term,
+                        np.where(self._term_mask[1:duration + 1], -self.prem_term, 0.0))
+
+    def _wl_cash_values(self, duration):
+        """WL surrender value at t = 0..duration: nil for 2 years, ramp to 85% of premiums, then bonus growth."""
+        t = np.arange(duration + 1)
+        wl_sv = np.zeros(duration + 1)
+        ramp = (t > 2) & (t <= self.payment_term)
+        wl_sv[ramp] = t[ramp] * self.prem_wl * ((t[ramp] - 2) / (self.payment_term - 2)) * 0.85
+        # After premiums stop it compounds from the last ramp value
+        pt = max(self.payment_term, 0)
+        if pt < duration:
+            growth = np.full(duration - pt + 1, 1 + self.wl_par_return)
+            growth[0] = wl_sv[pt]
+            wl_sv[pt:] = np.cumprod(growth)
+        return wl_sv
+
+    def calculate_projection(self, investment_return, discount_rate):
+        """Act 1 projection as a SimulationResult of arrays. Caching is left to the Streamlit layer."""
+        return self._project(float(investment_return), float(discount_rate))
+
+    def calculate_nominal(self, investment_return):
+        """(ages, BTID fund, WL cash value) only: no death benefits, no discounting."""
         duration = self.death_age - self.current_age + 1
-        plot_ages = [self.current_age + i for i in range(duration + 1)]
-        
-        btid_fund_accum = [0]
-        wl_sv_accum = [0]
-        fund = 0
-        wl_sv = 0
-        prev_wl_sv = 0
-        total_wl_paid = 0
-        
-        for t in range(1, duration + 1):
-            age = self.current_age + t
-            # BTID
-            cf = 0
-            if t <= self.payment_term: cf = self.prem_wl - self.prem_term
-            elif age < self.term_expiry_age: cf = -self.prem_term
-            fund = (fund + cf) * (1 + investment_return)
-            if fund < 0: fund = 0
-            btid_fund_accum.append(fund)
-            
-            # WL
-            if t <= self.payment_term: total_wl_paid += self.prem_wl
-            if t <= 2: wl_sv = 0
-            elif t <= self.payment_term: 
-                progress = (t - 2) / (self.payment_term - 2)
-                wl_sv = total_wl_paid * progress * 0.85
-            else: 
-                wl_sv = prev_wl_sv * (1 + self.wl_par_return)
-            prev_wl_sv = wl_sv
-            wl_sv_accum.append(wl_sv)
-            
-        btid_death = []
-        wl_death = []
-        for i, age in enumerate(plot_ages):
-            term_val = self.sa if age < self.term_expiry_age else 0
-            btid_death.append(term_val + btid_fund_accum[i])
-            mult = self.multiplier_factor if age < self.multiplier_age else 1.0
-            wl_val = max(self.sa * mult, self.sa + wl_sv_accum[i])
-            wl_death.append(wl_val)
-            
-        disc = (1 + discount_rate) ** -np.arange(len(plot_ages))
-        return pd.DataFrame({
-            "Age": plot_ages,
-            "BTID_Nominal": btid_fund_accum, "WL_Nominal": wl_sv_accum,
-            "BTID_Death": btid_death, "WL_Death": wl_death,
-            "BTID_PV": np.array(btid_fund_accum) * disc, "WL_PV": np.array(wl_sv_accum) * disc
-        })
+        ages = self.current_age + np.arange(duration + 1)
+        btid_fund_accum = _btid_fund_kernel(self._btid_cashflows(duration), float(investment_return))
+        return ages, btid_fund_accum, self._wl_cash_values(duration)
 
-    def get_crossover_age(self, investment_return):
-        temp_model = DeterministicModel(
-            self.current_age, 100, self.sa, self.prem_wl, self.prem_term, 
-            self.wl_par_return, self.payment_term,
-            self.multiplier_factor, self.multiplier_age, self.term_expiry_age
+    def _project(self, investment_return, discount_rate):
+        ages, btid_fund_accum, wl_sv_accum = self.calculate_nominal(investment_return)
+        duration = len(ages) - 1
+        years = ages - self.current_age
+
+        btid_death = np.where(self._term_mask[:duration + 1], self.sa, 0.0) + btid_fund_accum
+        mult = np.where(self._mult_mask[:duration + 1], self.multiplier_factor, 1.0)
+        wl_death = np.maximum(self.sa * mult, self.sa + wl_sv_accum)
+
+        disc = (1.0 + discount_rate) ** -years
+        return SimulationResult(
+            ages, btid_fund_accum, wl_sv_accum, btid_death, wl_death,
+            btid_fund_accum * disc, wl_sv_accum * disc
         )
-        df = temp_model.calculate_simulation(investment_return, 0.0)
-        subset = df[df['Age'] > (self.current_age + 5)]
-        wins = subset[subset['WL_Nominal'] > subset['BTID_Nominal']]
-        if wins.empty: return 100
-        return wins['Age'].iloc[0]
+
+    def calculate_simulation(self, investment_return, discount_rate):
+        res = self.calculate_projection(investment_return, discount_rate)
+        # One contiguous float32 block for the value columns (plenty for dollar amounts); Age as int16
+        block = np.empty((len(res.age), 6), np.float32)
+        for j, col in enumerate(res[1:]): block[:, j] = col
+        df = pd.DataFrame(block, copy=False,
+                          columns=["BTID_Nominal", "WL_Nominal", "BTID_Death", "WL_Death", "BTID_PV", "WL_PV"])
+        df.insert(0, "Age", res.age.astype(np.int16))
+        return df
+
+    @cached_property
+    def _frontier_schedules(self):
+        """(cashflows, WL cash values) to age 100. Neither depends on the market return, so build them once per model."""
+        duration = _MAX_AGE - self.current_age + 1
+        return self._btid_cashflows(duration), self._wl_cash_values(duration)
+
+    @cached_property
+    def _mc_surrender_values(self):
+        """
+        WL surrender value the Monte Carlo pays out, by policy year 0..(100 - current_age + 1).
+        Straight-line on premiums paid rather than the Act 1 ramp, so it's its own schedule.
+        """
+        pt = self.payment_term
+        y = np.arange(_MAX_AGE - self.current_age + 2)
+        sv = np.zeros(len(y))
+        ramp = (y > 2) & (y <= pt)
+        sv[ramp] = (y[ramp] * self.prem_wl) * 0.85 * (y[ramp] / pt)
+        tail = (y > 2) & (y > pt)
+        sv[tail] = (self.prem_wl * pt) * 0.85 * ((1 + self.wl_par_return) ** (y[tail] - pt))
+        return sv
+
+    def get_crossover_age(self, investment_return):
+        """Single-return version of get_crossover_ages; reuses this model's frontier schedules."""
+        return int(self.get_crossover_ages(np.array([float(investment_return)]))[0])
+
+    def get_crossover_ages(self, returns):
+        """
+        For each market return, the first age (after a 5-year grace period) where WL cash value
+        overtakes the BTID fund, projecting to age 100. Returns 100 if WL never catches up.
+        """
+        cf, wl = self._frontier_schedules
+        return _frontier_kernel(np.asarray(returns, dtype=np.float64), cf, wl, self.current_age,
+                                self.payment_term, self.term_expiry_age, self.wl_par_return)
 
     @staticmethod
     def calculate_cumulative_risk(current_age, target_age, gender):
+        """Chance (%) of a DTPD claim between current_age and target_age; 0 if the rate table is missing."""
+        # Caught out here so a missing CSV isn't memoized: the gauge recovers once the file is back
         try:
-            df_death = pd.read_csv("death_rates.csv") 
-            df_ci = pd.read_csv("ci_rates.csv")       
-            latest_year = df_death['year'].max()
-            df_death = df_death[(df_death['year'] == latest_year) & (df_death['sex'] == gender)]
-            ci_col = "S0408DTPD Male" if gender == "Male" else "S0408DTPD Female"
-            cumulative_survival_prob = 1.0
-            for age in range(current_age, target_age):
-                try:
-                    raw_dtpd = df_ci.loc[df_ci['Age Last'] == age, ci_col].values[0]
-                    q_dtpd = raw_dtpd / 1000.0 
-                    q_risk = q_dtpd * 1.3
-                except:
-                    q_risk = 0.05 
-                cumulative_survival_prob *= (1 - q_risk)
-            return (1 - cumulative_survival_prob) * 100
-        except:
+            return _cumulative_risk(current_age, target_age, gender)
+        except FileNotFoundError:
             return 0.0
 
-    @st.cache_data
-    def load_actuarial_tables():
-        df_death = pd.read_csv("death_rates.csv")
-        df_ci = pd.read_csv("ci_rates.csv")
-        return df_death, df_ci
-
-    def run_stochastic_simulation(self, n_sims, gender, r_inv, r_disc, enable_multi_pay=False, max_ci_claims=2):
+    def run_stochastic_simulation(self, n_sims, gender, r_inv, r_disc, enable_multi_pay=False, max_ci_claims=2, seed=None):
         """
         Simulates lives with:
         1. Mortality Loading (Sick people die faster).
         2. Maximum Age Cap (Everyone dies at 100).
         3. Corrected Single vs Multi Pay logic.
+        Pass `seed` for a reproducible batch.
         """
         try:
-            df_death = pd.read_csv("death_rates.csv")
-            df_ci = pd.read_csv("ci_rates.csv")
-            latest_year = df_death['year'].max()
-            death_rates = df_death[(df_death['year'] == latest_year) & (df_death['sex'] == gender)].set_index('age_x')['qx'].to_dict()
-            
-            ci_col = "S0408DTPD Male" if gender == "Male" else "S0408DTPD Female"
-            ci_rates = (df_ci.set_index('Age Last')[ci_col] / 1000.0 * 1.3).to_dict()
-        except:
-            return pd.DataFrame() 
-
-        results = []
-        max_simulation_age = 100  # The hard stop
-        
+            q_death, q_ci = _gender_rates(gender)
+        except FileNotFoundError:
+            return pd.DataFrame()
+
         limit_wl_claims = max_ci_claims if enable_multi_pay else 1
-        limit_term_claims = 1 
-        
-        for _ in range(n_sims):
-            age = self.current_age
-            alive = True
-            
-            # State Tracking
-            wl_claims_count = 0
-            term_claims_count = 0
-            health_ci_count = 0  # NEW: Tracks physical health separate from policy claims
-            
-            # Funds
-            btid_fund = 0.0
-            wl_cash_received = 0.0
-            
-            # Status Flags
-            wl_active = True
-            term_active = True
-            
-            event_log = []
-            
-            while alive and age <= max_simulation_age:
-                year_idx = age - self.current_age + 1
-                
-                # --- 1. MORTALITY & HEALTH DYNAMICS ---
-                base_q_d = death_rates.get(age, 0.05)
-                base_q_ci = ci_rates.get(age, 0.05)
-                
-                # Mortality Loading: Healthier people live longer
-                if health_ci_count == 0:
-                    q_d = base_q_d
-                elif health_ci_count == 1:
-                    q_d = min(0.99, base_q_d * 2.5) 
-                else:
-                    q_d = min(0.99, base_q_d * 5.0) 
-                
-                # Grim Reaper at 100
-                if age == max_simulation_age:
-                    is_death = True
-                    is_ci = False
-                else:
-                    roll = np.random.random()
-                    is_death = roll < q_d
-                    is_ci = False
-                    if not is_death:
-                        is_ci = roll < (q_d + base_q_ci)
-
-                if is_ci: health_ci_count += 1
-
-                # --- 2. CALCULATE POLICY VALUES ---
-                mult = self.multiplier_factor if age < self.multiplier_age else 1.0
-                total_paid = min(year_idx, self.payment_term) * self.prem_wl
-                
-                if year_idx <= 2: wl_sv_current = 0
-                elif year_idx <= self.payment_term: wl_sv_current = total_paid * 0.85 * ((year_idx)/(self.payment_term))
-                else: wl_sv_current = (self.prem_wl * self.payment_term) * 0.85 * ((1 + self.wl_par_return) ** (year_idx - self.payment_term))
-
-                # --- 3. EVENT HANDLING & LOGGING ---
-                payout_this_turn = False # Only log if money moves
-                
-                if is_death:
-                    alive = False
-                    
-                    # WL Death Payout
-                    if wl_active and wl_claims_count < limit_wl_claims:
-                        if wl_claims_count == 0:
-                            payout = max(self.sa * mult, self.sa + wl_sv_current)
-                        else:
-                            payout = self.sa * mult # Multi-Pay Death
-                        
-                        wl_cash_received += payout
-                        wl_active = False
-                        payout_this_turn = True
-                    
-                    # Term Death Payout
-                    if term_active and term_claims_count < limit_term_claims and age < self.term_expiry_age:
-                        btid_fund += self.sa
-                        term_active = False
-                        payout_this_turn = True
-
-                    # LOGGING FIX: Only log "Death" if a claim was paid
-                    if payout_this_turn:
-                        event_log.append("Death")
-                    
-                    break 
-                    
-                elif is_ci:
-                    # WL CI Payout
-                    if wl_active and wl_claims_count < limit_wl_claims:
-                        if wl_claims_count == 0:
-                            payout = max(self.sa * mult, self.sa + wl_sv_current)
-                        else:
-                            payout = self.sa * mult
-                            
-                        wl_cash_received += payout
-                        wl_claims_count += 1
-                        payout_this_turn = True
-                        
-                        # SINGLE PAY TERMINATION
-                        if not enable_multi_pay:
-                            wl_active = False 
-                    
-                    # Term CI Payout
-                    if term_active and term_claims_count < limit_term_claims and age < self.term_expiry_age:
-                        btid_fund += self.sa
-                        term_claims_count += 1
-                        term_active = False 
-                        payout_this_turn = True
-
-                    # LOGGING FIX: Only log "CI" if a claim was paid
-                    if payout_this_turn:
-                        event_log.append("CI")
-
-                # --- 4. CASHFLOW ---
-                if wl_cash_received > 0: wl_cash_received *= (1 + r_inv)
-                
-                budget = self.prem_wl if year_idx <= self.payment_term else 0
-                term_premium_due = self.prem_term if (age < self.term_expiry_age and term_active) else 0
-                
-                net_savings = budget - term_premium_due
-                btid_fund = (btid_fund + net_savings) * (1 + r_inv)
-                if btid_fund < 0: btid_fund = 0
-                
-                age += 1
-            
-            # --- FINAL CALCULATION ---
-            years_passed = age - self.current_age
-            pv_factor = (1 + r_disc) ** -years_passed
-            event_str = " -> ".join(event_log) if event_log else "Survive"
-            
-            results.append({
-                "Event Chain": event_str,
-                "Final Age": age,
-                "Diff": (btid_fund * pv_factor) - (wl_cash_received * pv_factor)
-            })
-            
-        return pd.DataFrame(results)
\ No newline at end of file
+
+        # Draw every roll up front (one row per life, one per year) so the kernel stays deterministic.
+        # A single roll decides both death and CI, so one matrix is enough.
+        rng = np.random.default_rng(seed)
+        rolls = rng.random((n_sims, max(_MAX_AGE - self.current_age, 0)))
+        final_ages, diffs, chains = _run_mc_kernel(
+            rolls, self.current_age, self.sa, self.prem_wl, self.prem_term, self.multiplier_factor,
+            self._mc_surrender_values, self._pay_mask, self._term_mask, self._mult_mask,
+            q_death, q_ci, float(r_inv), float(r_disc), int(limit_wl_claims), bool(enable_multi_pay)
+        )
+
+        # Only a handful of distinct chains occur, so decode each once and scatter back
+        codes, inverse = np.unique(chains, return_inverse=True)
+        decoded = [_decode_chain(int(c)) for c in codes]
+        event_chains = pd.Categorical.from_codes(inverse, [" -> ".join(d) if d else "Survive" for d in decoded])
+        n_ci_claims = np.array([d.count("CI") for d in decoded], dtype=np.int8)[inverse]
+        return pd.DataFrame({"Event Chain": event_chains, "Final Age": final_ages.astype(np.int16),
+                             "Diff": diffs.astype(np.float32), "n_ci_claims": n_ci_claims})
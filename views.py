@@ -0,0 +1,394 @@
+from collections import namedtuple
+
+import streamlit as st
+import numpy as np
+import plotly.graph_objects as go
+from model import DeterministicModel
+
+# Everything the sidebar collects, plus the derived premium totals
+Inputs = namedtuple("Inputs", [
+    "current_age", "gender", "death_age", "sa", "term_age", "pay_term", "mult_factor", "mult_age",
+    "r_invest", "volatility", "r_disc",
+    "prem_wl_total", "prem_term_total", "stop_age", "monthly_save", "annual_save",
+])
+
+# The policy terms the cached helpers below are keyed on (a subset of Inputs)
+Policy = namedtuple("Policy", [
+    "current_age", "death_age", "sa", "prem_wl", "prem_term", "pay_term", "mult_factor", "mult_age", "term_age",
+])
+
+# --- CACHED MODEL RUNS ---
+# Keyed on scalar inputs only, so view toggles (radio, gender, sliders) don't re-run the math.
+@st.cache_resource(max_entries=64)
+def _get_model(current_age, death_age, sa, prem_wl, prem_term, pay_term, mult_factor, mult_age, term_age):
+    return DeterministicModel(
+        current_age, death_age, sa, prem_wl, prem_term, 0.0375, pay_term,
+        multiplier_factor=mult_factor, multiplier_age=mult_age, term_expiry_age=term_age
+    )
+
+@st.cache_data(max_entries=64)
+def _simulate(current_age, death_age, sa, prem_wl, prem_term, pay_term, mult_factor, mult_age, term_age, r_invest, r_disc):
+    model = _get_model(current_age, death_age, sa, prem_wl, prem_term, pay_term, mult_factor, mult_age, term_age)
+    return model.calculate_projection(r_invest, r_disc)
+
+# Keyed on what the sweep reads: it always projects to 100 and compares the BTID fund with WL cash value,
+# so death_age, sa and the multiplier (death benefits only) aren't part of the key
+@st.cache_data(max_entries=32)
+def _frontier(current_age, prem_wl, prem_term, pay_term, term_age, returns):
+    model = DeterministicModel(current_age, 100, 0.0, prem_wl, prem_term, 0.0375, pay_term, term_expiry_age=term_age)
+    return model.get_crossover_ages(np.array(returns))
+
+# Same inputs -> same batch of lives, so re-clicking the button doesn't redraw the histogram
+@st.cache_data(max_entries=16)
+def _monte_carlo(current_age, death_age, sa, prem_wl, prem_term, pay_term, mult_factor, mult_age, term_age,
+                 n_sims, gender, r_invest, r_disc, enable_multi, max_claims):
+    model = _get_model(current_age, death_age, sa, prem_wl, prem_term, pay_term, mult_factor, mult_age, term_age)
+    return model.run_stochastic_simulation(n_sims, gender, r_invest, r_disc,
+                                           enable_multi_pay=enable_multi, max_ci_claims=max_claims)
+
+def _policy(inputs):
+    """Policy terms shared by the cached helpers above; pass them on with **_policy(inputs)._asdict()."""
+    return Policy(inputs.current_age, inputs.death_age, inputs.sa, inputs.prem_wl_total, inputs.prem_term_total,
+                  inputs.pay_term, inputs.mult_factor, inputs.mult_age, inputs.term_age)
+
+
+# ==========================================
+# 1. SIDEBAR INPUTS (Step 2: Edit Assumptions)
+# ==========================================
+def render_inputs():
+    # Tip for Light Mode
+    st.sidebar.info("💡 **Tip:** If graphs are dark, go to Settings (top right) > Theme > 'Light'.")
+
+    # Inputs live in a form so the model only reruns on submit, not on every keystroke.
+    with st.sidebar.form("assumptions"):
+        st.header("Step 2: Edit Assumptions")
+
+        # --- A. PERSONAL PROFILE ---
+        with st.expander("👤 Personal Profile", expanded=True):
+            col_p1, col_p2 = st.columns(2)
+            with col_p1:
+                current_age = st.number_input("Current Age", 20, 60, 30, step=1)
+            with col_p2:
+                gender = st.selectbox("Gender", ["Male", "Female"])
+
+            death_age = st.number_input("Projection Age", 60, 100, 85, step=1, help="How long do you expect to live?")
+
+        # --- B. TERM INSURANCE ---
+        with st.expander("🔴 Term + Invest", expanded=True):
+            base_prem_term = st.number_input("Term Premium ($/yr)", value=800, step=50)
+            sa = st.number_input("Sum Assured ($)", value=300000, step=10000)
+            term_age = st.number_input("Term Expires At Age", 60, 99, 70, step=1)
+            cost_ci_term = st.number_input("Term Rider Cost ($/yr)", value=0, step=50)
+
+        # --- C. WHOLE LIFE ---
+        with st.expander("🔵 Whole Life", expanded=True):
+            base_prem_wl = st.number_input("WL Premium ($/yr)", value=6000, step=100)
+            pay_term = st.number_input("Payment Term (Yrs)", value=20, step=1)
+            mult_factor = st.selectbox("Multiplier Factor", [1.0, 2.0, 3.0, 4.0, 5.0], index=2)
+            mult_age = st.number_input("Multiplier Drop-off Age", 60, 85, 70, step=1)
+            cost_ci_wl = st.number_input("WL Rider Cost ($/yr)", value=0, step=50)
+
+        # --- D. MARKET ---
+        with st.expander("📈 Market Assumptions", expanded=False):
+            r_invest = st.number_input("Exp. Return (%)", 0.0, 15.0, 5.0, 0.5) / 100
+            # NEW INPUT: Volatility for Act 3
+            volatility = st.number_input("Market Volatility (%)", 0.0, 30.0, 12.0, 1.0, help="Standard Deviation. S&P500 is ~15%. Bonds are ~5%.") / 100
+            r_disc = st.number_input("Risk-Free Rate (%)", 0.0, 8.0, 3.0, 0.1) / 100
+
+        st.caption("💡 **Note:** Rider costs reduce your investible difference.")
+        st.form_submit_button("Recalculate", use_container_width=True)
+
+    # --- Derived Variables ---
+    prem_wl_total = base_prem_wl + cost_ci_wl
+    prem_term_total = base_prem_term + cost_ci_term
+    return Inputs(
+        current_age, gender, death_age, sa, term_age, pay_term, mult_factor, mult_age,
+        r_invest, volatility, r_disc,
+        prem_wl_total, prem_term_total,
+        stop_age=current_age + pay_term,
+        monthly_save=(prem_wl_total - prem_term_total) / 12,
+        annual_save=prem_wl_total - prem_term_total,
+    )
+
+
+# ==========================================
+# 2. MAIN BODY: CONTEXT (Step 1)
+# ==========================================
+def render_context(inputs):
+    st.markdown("### Step 1: Context & Architecture")
+
+    col1, col2 = st.columns([1, 1])
+
+    with col1:
+        with st.expander("📚 Product Logic (Read Me)", expanded=True):
+            st.markdown(f"""
+            **🔴 Option A: Buy Term + Invest**
+            * **Cost:** You pay **${inputs.prem_term_total:,.0f}/yr** for Insurance.
+            * **Strategy:** Invest the savings (**${inputs.annual_save:,.0f}/yr**).
+            * **Claims:** If you die, family gets **${inputs.sa:,.0f}** + Portfolio Value.
+
+            **🔵 Option B: Whole Life**
+            * **Cost:** Bundled product. You pay **${inputs.prem_wl_total:,.0f}/yr**.
+            * **Claims:** Higher of ({inputs.mult_factor}x SA) OR (SA + Bonuses).
+            """)
+
+    with col2:
+        st.info(f"""
+        **📋 Scenario Summary:**
+        * **Life Plan:** Projecting from Age **{inputs.current_age}** to **{inputs.death_age}**.
+        * **Save & Invest:** You have **${inputs.monthly_save:,.0f}/mth** extra to invest if you buy Term.
+        * **Premiums Stop:** At Age **{inputs.stop_age}** (in {inputs.pay_term} years).
+        * **Coverage:** WL is **{inputs.mult_factor}x** (Age {inputs.mult_age}); Term is **${inputs.sa:,.0f}** (Age {inputs.term_age}).
+        """)
+
+
+# --- ACT 1: DETERMINISTIC ---
+def render_act1(inputs):
+    st.caption("Assumes you are a 'Robot' who invests 100% of the savings perfectly with no withdrawals.")
+    _act1_charts(inputs)
+
+
+# Fragment: toggling the view radio only reruns these charts, not the whole script.
+@st.fragment
+def _act1_charts(inputs):
+    view_mode = st.radio("Graph View Mode", ["Nominal Value (Cash)", "Present Value (Today's $)"], index=1, horizontal=True)
+
+    graph_tab1, graph_tab2 = st.tabs(["📊 Financial Analysis", "🏁 The 'Winning' Frontier"])
+
+    with graph_tab1:
+        col_left, col_right = st.columns(2)
+
+        with col_left:
+            st.subheader("1. Liquidity (Wealth)")
+            st.plotly_chart(_liquidity_fig(_policy(inputs), inputs.r_invest, inputs.r_disc, view_mode, inputs.stop_age), use_container_width=True)
+
+        with col_right:
+            st.subheader("2. Legacy & Critical Illness")
+            st.caption("Also represents Max CI Payout during Multiplier years.")
+            if "Present" in view_mode: st.info("Note: Nominal terms used for clarity.")
+            st.plotly_chart(_legacy_fig(_policy(inputs), inputs.r_invest, inputs.r_disc), use_container_width=True)
+
+    with graph_tab2:
+        render_frontier(inputs)
+
+
+def render_frontier(inputs):
+    st.subheader("Strategy Frontier: How long does BTID stay ahead?")
+    with st.spinner("Computing frontier..."):
+        fig = _frontier_fig(_policy(inputs))
+    st.plotly_chart(fig, use_container_width=True)
+
+
+# --- ACT 1 FIGURES ---
+# Cached so reruns only pay for st.plotly_chart; cache_data hands back a fresh copy each time.
+# Keyed on just the fields each chart reads, so e.g. gender or volatility changes still hit.
+@st.cache_data(max_entries=16)
+def _liquidity_fig(policy, r_invest, r_disc, view_mode, stop_age):
+    res = _simulate(**policy._asdict(), r_invest=r_invest, r_disc=r_disc)
+    if "Present" in view_mode:
+        y_btid, y_wl, btid_vals, wl_vals = "BTID_PV", "WL_PV", res.btid_pv, res.wl_pv
+    else:
+        y_btid, y_wl, btid_vals, wl_vals = "BTID_Nominal", "WL_Nominal", res.btid_nominal, res.wl_nominal
+
+    fig1 = go.Figure()
+    fig1.add_trace(go.Scattergl(x=res.age, y=btid_vals, mode='lines', name=y_btid, line=dict(color="#2ca02c")))
+    fig1.add_trace(go.Scattergl(x=res.age, y=wl_vals, mode='lines', name=y_wl, line=dict(color="#1f77b4")))
+    fig1.add_vline(x=stop_age, line_dash="dash", line_color="red", annotation_text="Stop Pay")
+    fig1.update_layout(xaxis_title="Age", yaxis_title=f"Wealth ({view_mode})", legend_title_text='')
+    return fig1
+
+@st.cache_data(max_entries=16)
+def _legacy_fig(policy, r_invest, r_disc):
+    res = _simulate(**policy._asdict(), r_invest=r_invest, r_disc=r_disc)
+    current_age, death_age, term_age, mult_age = policy.current_age, policy.death_age, policy.term_age, policy.mult_age
+
+    fig2 = go.Figure()
+    fig2.add_trace(go.Scattergl(x=res.age, y=res.btid_death, mode='lines', name="BTID_Death", line=dict(color="#98df8a")))
+    fig2.add_trace(go.Scattergl(x=res.age, y=res.wl_death, mode='lines', name="WL_Death", line=dict(color="#aec7e8")))
+
+    fig2.add_vline(x=term_age, line_dash="dot", line_color="gray", annotation_text=f"Term Exp ({term_age})", annotation_position="top left")
+    fig2.add_shape(type="line", x0=mult_age, y0=0, x1=mult_age, y1=1, xref="x", yref="paper", line=dict(color="orange", width=1, dash="dot"))
+    fig2.add_annotation(x=mult_age, y=0.9, text=f"Mult. Drops ({mult_age})", showarrow=False, font=dict(color="orange"), xanchor="left", bgcolor="rgba(255, 255, 255, 0.7)")
+
+    if death_age > term_age:
+        val = res.btid_death[death_age - current_age]
+        fig2.add_annotation(x=term_age + (death_age - term_age)/2, y=val, text="🚀 'Unshackled' Growth", showarrow=True, arrowhead=1, ax=40, ay=-40, font=dict(size=10, color="green"))
+
+    fig2.update_layout(xaxis_title="Age", yaxis_title="Payout ($)", legend_title_text='')
+    return fig2
+
+@st.cache_data(max_entries=16)
+def _frontier_fig(policy):
+    current_age, death_age = policy.current_age, policy.death_age
+    returns = np.linspace(0.0, 0.1, 101)
+    crossover_ages = _frontier(current_age, policy.prem_wl, policy.prem_term, policy.pay_term, policy.term_age,
+                               tuple(returns))
+
+    return_pct = returns * 100
+    plot = crossover_ages < 100
+    # Every 5th point of the 0.1% grid is a 0.5% step; stride before filtering so gaps don't shift it
+    markers = np.arange(0, len(returns), 5)
+    markers = markers[crossover_ages[markers] < 100]
+
+    fig3 = go.Figure()
+    fig3.add_trace(go.Scattergl(x=return_pct[plot], y=crossover_ages[plot], mode='lines', line=dict(color="#636efa"), showlegend=False))
+    fig3.add_trace(go.Scattergl(x=return_pct[markers], y=crossover_ages[markers], mode='markers', marker=dict(color=fig3.data[0].line.color, size=8), showlegend=False))
+    fig3.update_xaxes(title="Market Return (%)")
+    fig3.add_hline(y=death_age, line_dash="dash", line_color="red", annotation_text="Your Death Age")
+    fig3.update_yaxes(range=[current_age, 100], title="Age WL Finally Overtakes")
+    return fig3
+
+
+# --- ACT 2: BEHAVIOR & PROBABILITY ---
+def render_act2(inputs):
+    res = _simulate(**_policy(inputs)._asdict(), r_invest=inputs.r_invest, r_disc=inputs.r_disc)
+    current_age, term_age, sa, gender = inputs.current_age, inputs.term_age, inputs.sa, inputs.gender
+
+    st.header("Act 2: The Human Factor")
+    st.markdown("Act 1 assumes a perfect world. Act 2 looks at **Discipline** and **Risk Probability**.")
+
+    # 1. DISCIPLINE
+    st.subheader("1. The Discipline Stress Test")
+    col_d1, col_d2 = st.columns([3, 1])
+
+    with col_d1:
+        discipline = st.slider("💰 Discipline Ratio: % of savings actually invested",
+                               min_value=0, max_value=100, value=100, step=10)
+
+        human_savings_annual = inputs.annual_save * (discipline / 100)
+        fake_wl_prem_for_human = inputs.prem_term_total + human_savings_annual
+
+        res_human = _simulate(current_age, inputs.death_age, sa, fake_wl_prem_for_human, inputs.prem_term_total, inputs.pay_term,
+                              inputs.mult_factor, inputs.mult_age, term_age, inputs.r_invest, inputs.r_disc)
+
+        fig_beh = go.Figure()
+        fig_beh.add_trace(go.Scatter(x=res.age, y=res.btid_nominal, name='Robot (100%)', line=dict(dash='dash', color='green')))
+        fig_beh.add_trace(go.Scatter(x=res_human.age, y=res_human.btid_nominal, name=f'You ({discipline}%)', fill='tonexty', line=dict(color='#d62728')))
+        fig_beh.add_trace(go.Scatter(x=res.age, y=res.wl_nominal, name='Whole Life (Forced)', line=dict(color='blue')))
+        fig_beh.update_layout(title="Wealth: Robot vs. Human", height=400, margin=dict(l=20, r=20, t=40, b=20))
+        st.plotly_chart(fig_beh, use_container_width=True)
+
+    with col_d2:
+        i_65 = 65 - current_age  # Age is a contiguous range starting at current_age
+        gap_65 = res.btid_nominal[i_65] - res_human.btid_nominal[i_65]
+        st.metric("Wealth Lost (Age 65)", f"${gap_65:,.0f}", delta_color="inverse")
+
+        wl_65 = res.wl_nominal[i_65]
+        human_65 = res_human.btid_nominal[i_65]
+        if wl_65 > human_65:
+            st.error("🚨 **Danger:** Whole Life WINS due to forced savings.")
+        else:
+            st.success("✅ **Safe:** Buy Term still wins.")
+
+    st.divider()
+
+    # 2. PROBABILITY
+    st.subheader("2. Risk Reality & ROI")
+    col_p1, col_p2 = st.columns(2)
+
+    with col_p1:
+        st.markdown("**Probability of Claim (During Coverage)**")
+        real_prob = DeterministicModel.calculate_cumulative_risk(current_age, term_age, gender)
+
+        fig_gauge = go.Figure(go.Indicator(
+            mode = "gauge+number",
+            value = real_prob,
+            number = {'suffix': "%", 'valueformat': ".1f"},
+            title = {'text': f"Chance of CI (Age {current_age}-{term_age})"},
+            gauge = {
+                'axis': {'range': [None, 100]},
+                'bar': {'color': "orange"},
+                'steps': [
+                    {'range': [0, 15], 'color': "#d4edda"},
+                    {'range': [15, 30], 'color': "#fff3cd"},
+                    {'range': [30, 100], 'color': "#f8d7da"}],
+                'threshold': {'line': {'color': "red", 'width': 4}, 'thickness': 0.75, 'value': 25}}
+        ))
+        fig_gauge.update_layout(height=250, margin=dict(l=30, r=30, t=50, b=20))
+        st.plotly_chart(fig_gauge, use_container_width=True)
+        st.caption(f"Based on S0408DTPD {gender} Tables (loaded 1.3x for Critical Illness).")
+
+    with col_p2:
+        st.markdown("**The 'Break-Even' Metric**")
+        total_term_cost = inputs.prem_term_total * (term_age - current_age)
+        leverage = sa / total_term_cost if total_term_cost > 0 else 0
+
+        m1, m2 = st.columns(2)
+        m1.metric("Total Term Cost", f"${total_term_cost:,.0f}")
+        m2.metric("Payout Leverage", f"{leverage:.1f}x")
+
+        st.info(f"You pay **\${total_term_cost:,.0f}** over {term_age - current_age} years for **\${sa:,.0f}** coverage.")
+
+
+# --- ACT 3: THE REALITY (STOCHASTIC LIFE EVENTS) ---
+def render_act3(inputs):
+    st.header("Act 3: Life Event Simulation (Monte Carlo)")
+    st.markdown("""
+    This simulation runs **1,000 distinct lifetimes**.
+    It models your **Health** (getting sick multiple times) separate from your **Policy** (payout rules).
+    """)
+
+    col_mc1, col_mc2 = st.columns([1, 2])
+    with col_mc1:
+        # Multi-Pay Toggle
+        enable_multi = st.checkbox("Enable Multi-Pay Mode?", value=False,
+                                  help="If checked, Whole Life allows multiple CI claims.")
+
+        # NEW: Max Claims Input (Conditional)
+        max_claims = 1
+        if enable_multi:
+            max_claims = st.number_input("Max Allowed CI Claims", min_value=2, max_value=5, value=2, step=1,
+                                        help="Most Multi-Pay plans cap major claims at 2 or 3.")
+
+    if st.button("🚀 Run 1,000 Lifetimes"):
+        with st.spinner("Simulating lives..."):
+            # Pass max_ci_claims to the model
+            sim_results = _monte_carlo(**_policy(inputs)._asdict(), n_sims=1000, gender=inputs.gender,
+                                       r_invest=inputs.r_invest, r_disc=inputs.r_disc,
+                                       enable_multi=enable_multi, max_claims=max_claims)
+
+            if not sim_results.empty:
+                # 1. METRICS
+                diffs = sim_results['Diff'].to_numpy()
+                win_rate = (diffs > 0).mean() * 100
+                avg_diff = diffs.mean()
+
+                c1, c2, c3 = st.columns(3)
+                c1.metric("BTID Win Rate", f"{win_rate:.1f}%")
+                c2.metric("Avg. Net Benefit", f"${avg_diff:,.0f}")
+                c3.metric("Simulated Lives", "1,000")
+
+                # 2. HISTOGRAM
+                counts, edges = np.histogram(diffs, bins=50)
+                fig_hist = go.Figure(go.Bar(
+                    x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges),
+                    marker_color='#2ca02c', name="Diff"
+                ))
+                fig_hist.update_layout(title="Distribution of Outcomes (Right = BTID Wins)", bargap=0,
+                                       xaxis_title="Net Present Value Difference ($)", yaxis_title="count")
+                fig_hist.add_vline(x=0, line_dash="dash", line_color="red", annotation_text="Breakeven")
+
+                # Annotations for Clusters
+                neg_out = diffs[diffs < 0]
+                pos_out = diffs[diffs > 0]
+                if neg_out.size:
+                    fig_hist.add_annotation(x=np.median(neg_out), y=10, text="Early/Multi Claim\n(WL Wins)",
+                                           showarrow=True, arrowhead=1, ax=0, ay=-40, font=dict(color="red"))
+                if pos_out.size:
+                    fig_hist.add_annotation(x=np.median(pos_out), y=10, text="Long Life\n(Inv Wins)",
+                                           showarrow=True, arrowhead=1, ax=0, ay=-40, font=dict(color="green"))
+
+                st.plotly_chart(fig_hist, use_container_width=True)
+
+                # 3. MULTI-CLAIM ANALYSIS
+                if enable_multi:
+                    multi_claims = sim_results[sim_results['n_ci_claims'] > 1]
+                    if not multi_claims.empty:
+                        count = len(multi_claims)
+                        st.warning(f"⚠️ **Multi-Claim Reality:** In {count} simulations ({count/10}%), the user claimed CI {max_claims} times. WL creates significant value here.")
+                        st.dataframe(multi_claims[['Event Chain', 'Final Age', 'Diff']].head(5))
+
+                with st.expander("View Raw Simulation Data"):
+                    st.dataframe(sim_results)
+            else:
+                st.error("Simulation failed. Check CSV files.")